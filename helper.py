@@ -1,6 +1,19 @@
+import array
+import concurrent.futures
 import datetime
+import functools
+import itertools
 import json
+import re
 import sys
+from typing import Union
+
+# ciso8601 is an optional C extension that parses ISO-8601 faster than the
+# standard library; fall back to datetime.fromisoformat when it isn't installed.
+try:
+    from ciso8601 import parse_datetime as _parse_iso_datetime
+except ImportError:
+    _parse_iso_datetime = datetime.datetime.fromisoformat
 
 # --- Custom Exceptions for Clear Error Handling ---
 class CalendarError(Exception):
@@ -18,99 +31,236 @@ class CalendarParseError(CalendarError):
 # --- Constants for mapping weekdays ---
 WEEKDAY_MAP = {"MO": 0, "TU": 1, "WE": 2, "TH": 3, "FR": 4, "SA": 5, "SU": 6}
 
+# --- Precompiled patterns for scanning ICS text ---
+# Only the properties the parser uses are matched; parameters such as
+# ";TZID=..." are skipped so group 2 is always the raw value. Lines may end in
+# CRLF, LF or a bare CR (as splitlines() allowed), so a property can also start
+# right after a "\r".
+_ICS_RE = re.compile(rb"(?m)(?:^|(?<=\r))(BEGIN|END|DTSTART|DTEND|SUMMARY|LOCATION|RRULE)(?:;[^:\r\n]*)?:([^\r\n]*)")
+# RFC 5545 folds long lines as a line break followed by one space or tab.
+_FOLD_RE = re.compile(rb"(?:\r\n|\r|\n)[ \t]")
+
 # --- Internal Helper for Parsing ---
-def _parse_dt_string(dt_str: str) -> datetime.datetime:
-    # ... (code is unchanged)
+def _split_dt_string(dt_str: str) -> tuple:
+    # ICS datetimes have a fixed layout (YYYYMMDDTHHMM[SS][Z]). Returns the
+    # (year, month, day, hour, minute, second) fields as strings, or None when
+    # the layout doesn't match. The length alone tells the two layouts apart,
+    # so the seconds field is picked up front rather than trying one format
+    # and falling back to the other.
     if dt_str.endswith('Z'):
         dt_str = dt_str[:-1]
-    for fmt in ("%Y%m%dT%H%M%S", "%Y%m%dT%H%M"):
-        try:
-            return datetime.datetime.strptime(dt_str, fmt)
-        except ValueError:
-            continue
-    return None
+    n = len(dt_str)
+    if n == 15:
+        seconds = dt_str[13:15]
+    elif n == 13:
+        seconds = "00"
+    else:
+        return None
+    if dt_str[8] != 'T':
+        return None
+    return dt_str[0:4], dt_str[4:6], dt_str[6:8], dt_str[9:11], dt_str[11:13], seconds
+
+# Schedule-style calendars repeat the same DTSTART/DTEND/UNTIL strings across
+# many events; datetimes are immutable, so parsed results can be shared.
+@functools.lru_cache(maxsize=4096)
+def _parse_dt_string(dt_str: str) -> datetime.datetime:
+    # Splice in the ISO separators and hand the result to a C-implemented
+    # ISO parser.
+    fields = _split_dt_string(dt_str)
+    if fields is None:
+        return None
+    y, mo, d, h, mi, s = fields
+    try:
+        return _parse_iso_datetime(f"{y}-{mo}-{d}T{h}:{mi}:{s}")
+    except ValueError:
+        return None
+
+@functools.lru_cache(maxsize=4096)
+def _parse_time_of_day(dt_str: str) -> datetime.time:
+    # DTEND only ever contributes its time of day, so no datetime is built.
+    # The date part is still validated, so a malformed DTEND is rejected
+    # exactly as _parse_dt_string would reject it.
+    fields = _split_dt_string(dt_str)
+    if fields is None:
+        return None
+    y, mo, d, h, mi, s = fields
+    try:
+        datetime.date.fromisoformat(f"{y}-{mo}-{d}")
+        return datetime.time.fromisoformat(f"{h}:{mi}:{s}")
+    except ValueError:
+        return None
 
 # --- Core Parsing Logic ---
-def parse_rrule_to_raw(rrule_str, start_dt):
-    # ... (code is unchanged)
-    rules = {}
+@functools.lru_cache(maxsize=1024)
+def _parse_rrule_cached(rrule_str: str, default_weekday: int) -> tuple:
+    # Single pass over the rule parts; only BYDAY and UNTIL are used, so no
+    # intermediate dict of all the rule parts is built.
+    # Bit i of days_mask is set when the event recurs on weekday i (Monday=0).
+    days_mask = None
+    until_dt = None
+    weekday_get = WEEKDAY_MAP.get
     for part in rrule_str.split(";"):
-        if "=" in part:
-            k, v = part.split("=", 1)
-            rules[k] = v
-    days = []
-    if "BYDAY" in rules:
-        day_codes = rules["BYDAY"].split(",")
-        days = [WEEKDAY_MAP[code] for code in day_codes if code in WEEKDAY_MAP]
-    elif start_dt:
-        days = [start_dt.weekday()]
-    until_dt = _parse_dt_string(rules.get("UNTIL", ""))
-    until_iso = until_dt.isoformat() if until_dt else None
-    return {"days": sorted(days), "until": until_iso}
-
-def parse_ics_to_raw(ics_text: str):
-    # ... (code is unchanged)
+        eq = part.find("=")
+        if eq < 0:
+            continue
+        k = part[:eq]
+        if k == "BYDAY":
+            days_mask = 0
+            for code in part[eq + 1:].split(","):
+                d = weekday_get(code)
+                if d is not None:
+                    days_mask |= 1 << d
+        elif k == "UNTIL":
+            until_dt = _parse_dt_string(part[eq + 1:])
+    if days_mask is None:
+        days_mask = 1 << default_weekday if default_weekday >= 0 else 0
+    return days_mask, until_dt
+
+def parse_rrule_to_raw(rrule_str, start_dt):
+    # Calendars often share identical RRULE strings across events. The only
+    # part of start_dt that matters is its weekday (the BYDAY default), so
+    # the parse is cached on (rrule_str, weekday).
+    default_weekday = start_dt.weekday() if start_dt else -1
+    days_mask, until_dt = _parse_rrule_cached(rrule_str, default_weekday)
+    return {"days_mask": days_mask, "until": until_dt}
+
+def parse_ics_to_raw(ics_text: Union[bytes, str]):
+    # The scan runs over raw bytes: property names and datetimes are ASCII, so
+    # only SUMMARY and LOCATION values need decoding. str input is accepted
+    # for callers that already hold decoded text.
+    if isinstance(ics_text, str):
+        ics_text = ics_text.encode("utf-8")
     events = []
     current_event_data = None
     start_dt_for_rrule = None
-    in_event_block = False
-    for line in ics_text.splitlines():
-        line = line.strip()
-        if line == "BEGIN:VEVENT":
-            in_event_block = True
-            current_event_data = {}
-            start_dt_for_rrule = None
+    parse_dt = _parse_dt_string
+    # Unfolding builds a full copy of the text, so only do it when a folded
+    # line is actually present.
+    if (b"\n " in ics_text or b"\n\t" in ics_text
+            or b"\r " in ics_text or b"\r\t" in ics_text):
+        ics_text = _FOLD_RE.sub(b"", ics_text)
+    # current_event_data doubles as the state flag: it is None outside a
+    # VEVENT block, so properties of VCALENDAR/VTIMEZONE are skipped before
+    # any string work is done on them.
+    for m in _ICS_RE.finditer(ics_text):
+        key, value = m.group(1, 2)
+        if key == b"BEGIN":
+            if value.rstrip() == b"VEVENT":
+                current_event_data = {}
+                start_dt_for_rrule = None
             continue
-        if line == "END:VEVENT":
-            in_event_block = False
-            if current_event_data:
-                events.append(current_event_data)
-            current_event_data = None
+        if key == b"END":
+            if value.rstrip() == b"VEVENT":
+                if current_event_data:
+                    events.append(current_event_data)
+                current_event_data = None
             continue
-        if in_event_block and current_event_data is not None and ":" in line:
-            key, value = line.split(":", 1)
-            key = key.split(";")[0]
-            if key == "DTSTART":
-                dt = _parse_dt_string(value)
-                if dt:
-                    current_event_data["start_time"] = dt.time().isoformat()
-                    start_dt_for_rrule = dt 
-            elif key == "DTEND":
-                dt = _parse_dt_string(value)
-                if dt:
-                    current_event_data["end_time"] = dt.time().isoformat()
-            elif key == "SUMMARY":
-                current_event_data["summary"] = value
-            elif key == "LOCATION":
-                current_event_data["location"] = value.strip()
-            elif key == "RRULE":
-                rrule_data = parse_rrule_to_raw(value, start_dt_for_rrule)
-                current_event_data.update(rrule_data)
+        if current_event_data is None:
+            continue
+        value = value.rstrip()
+        if key == b"DTSTART":
+            dt = parse_dt(value.decode("latin-1"))
+            if dt:
+                current_event_data["start_time"] = dt.time()
+                start_dt_for_rrule = dt
+        elif key == b"DTEND":
+            end_time = _parse_time_of_day(value.decode("latin-1"))
+            if end_time is not None:
+                current_event_data["end_time"] = end_time
+        elif key == b"SUMMARY":
+            current_event_data["summary"] = value.decode("utf-8")
+        elif key == b"LOCATION":
+            current_event_data["location"] = value.lstrip().decode("utf-8")
+        elif key == b"RRULE":
+            rrule_data = parse_rrule_to_raw(value.decode("latin-1"), start_dt_for_rrule)
+            current_event_data.update(rrule_data)
     return {"events": events}
 
+def _time_to_seconds(t: datetime.time) -> int:
+    if t is None:
+        return -1
+    return t.hour * 3600 + t.minute * 60 + t.second
+
+def build_events_soa(events: list) -> dict:
+    """Returns a column-per-field view of parsed events for use with events_on_date."""
+    # "Which events fall on date D" then scans two flat integer arrays instead
+    # of a dict per event.
+    no_until = datetime.date.max.toordinal()
+    return {
+        "days_mask": array.array("b", [e.get("days_mask", 0) for e in events]),
+        "until_ord": array.array("l", [e["until"].date().toordinal() if e.get("until") else no_until for e in events]),
+        "start_sec": array.array("l", [_time_to_seconds(e.get("start_time")) for e in events]),
+        "end_sec": array.array("l", [_time_to_seconds(e.get("end_time")) for e in events]),
+        "summary": [e.get("summary") for e in events],
+    }
+
+def events_on_date(soa: dict, check_date: datetime.date) -> list:
+    """Returns the indices of the events in `soa` (from build_events_soa) that occur on `check_date`."""
+    weekday_bit = 1 << check_date.weekday()
+    day_ord = check_date.toordinal()
+    return [
+        i for i, (days_mask, until_ord) in enumerate(zip(soa["days_mask"], soa["until_ord"]))
+        if days_mask & weekday_bit and until_ord >= day_ord
+    ]
+
 def is_event_on_date(event: dict, check_date: datetime.date = None):
-    # ... (code is unchanged)
     if check_date is None:
         check_date = datetime.date.today()
     if event.get("until"):
-        until_dt = datetime.datetime.fromisoformat(event["until"])
-        if check_date > until_dt.date():
+        if check_date > event["until"].date():
             return False
-    if check_date.weekday() not in event.get("days", []):
+    if not ((event.get("days_mask", 0) >> check_date.weekday()) & 1):
         return False
     return True
 
+def _weekday_offsets(start_ord: int, days_mask: int) -> list:
+    # Ordinal 1 (0001-01-01) is a Monday, so weekday(o) == (o + 6) % 7.
+    # Returns the day offsets (0-6) from start_ord that fall on a masked
+    # weekday, in ascending order.
+    start_weekday = (start_ord + 6) % 7
+    return [off for off in range(7) if (days_mask >> ((start_weekday + off) % 7)) & 1]
+
+def _iter_ordinals(start_ord: int, last_ord: int, days_mask: int):
+    # Each masked weekday is one stride-7 range. Zipping the ranges yields
+    # them week by week in date order without sorting; the ranges that are
+    # one longer than the last fill in the final partial week. Everything
+    # runs lazily in C, so the per-day work stays out of the interpreter.
+    ranges = [range(start_ord + off, last_ord + 1, 7) for off in _weekday_offsets(start_ord, days_mask)]
+    if not ranges:
+        return iter(())
+    full_weeks = len(ranges[-1])
+    tail = [r[full_weeks] for r in ranges if len(r) > full_weeks]
+    return itertools.chain(itertools.chain.from_iterable(zip(*ranges)), tail)
+
+def _ordinal_bounds(event: dict, start_range: datetime.date, end_range: datetime.date) -> tuple:
+    # The first and last day ordinals to expand, with the range clamped to UNTIL.
+    start_ord = start_range.toordinal()
+    last_ord = end_range.toordinal()
+    if event.get("until"):
+        last_ord = min(last_ord, event["until"].date().toordinal())
+    return start_ord, last_ord
+
 def expand_event_occurrences(event: dict, start_range: datetime.date, end_range: datetime.date):
-    # ... (code is unchanged)
-    start_time = datetime.time.fromisoformat(event["start_time"])
-    end_time = datetime.time.fromisoformat(event["end_time"])
-    current_date = start_range
-    while current_date <= end_range:
-        if is_event_on_date(event, current_date):
-            start_datetime = datetime.datetime.combine(current_date, start_time)
-            end_datetime = datetime.datetime.combine(current_date, end_time)
-            yield (start_datetime, end_datetime)
-        current_date += datetime.timedelta(days=1)
+    # Thin generator over _iter_ordinals: dates are produced lazily, so taking
+    # the first few occurrences of a long range stays cheap.
+    start_time = event["start_time"]
+    end_time = event["end_time"]
+    start_ord, last_ord = _ordinal_bounds(event, start_range, end_range)
+    combine = datetime.datetime.combine
+    for current_date in map(datetime.date.fromordinal, _iter_ordinals(start_ord, last_ord, event.get("days_mask", 0))):
+        yield (combine(current_date, start_time), combine(current_date, end_time))
+
+def to_json_safe(event: dict) -> dict:
+    """Returns a copy of a parsed event with ISO strings and a `days` list for JSON."""
+    safe_event = dict(event)
+    if "days_mask" in safe_event:
+        days_mask = safe_event.pop("days_mask")
+        safe_event["days"] = [d for d in range(7) if (days_mask >> d) & 1]
+    for key in ("start_time", "end_time", "until"):
+        value = safe_event.get(key)
+        if value is not None:
+            safe_event[key] = value.isoformat()
+    return safe_event
 
 
 # In ics_parser.py
@@ -133,7 +283,7 @@ def load_and_parse_calendar(file_path: str) -> dict:
         CalendarParseError: If the file cannot be read or has an invalid format.
     """
     try:
-        with open(file_path, "r", encoding="utf-8") as f:
+        with open(file_path, "rb") as f:
             ics_data = f.read()
         
         # We also try to parse inside this block
@@ -151,6 +301,26 @@ def load_and_parse_calendar(file_path: str) -> dict:
         # ...and RAISE our other specific alarm.
         raise CalendarParseError(f"Failed to read or parse '{file_path}'. The file may be corrupt or in an unexpected format. Details: {e}")
 
+def load_and_parse_calendars(file_paths: list, max_workers: int = 8) -> list:
+    """
+    Loads and parses many .ics files, overlapping the blocking file reads.
+
+    Args:
+        file_paths: The paths to the .ics calendar files.
+        max_workers: The maximum number of files read at the same time.
+
+    Returns:
+        A list of parsed calendar dictionaries, in the same order as file_paths.
+
+    Raises:
+        CalendarNotFoundError: If any file does not exist at its path.
+        CalendarParseError: If any file cannot be read or has an invalid format.
+    """
+    # File reads release the GIL, so a thread pool lets the kernel service
+    # several of them at once while earlier files are being parsed.
+    with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as pool:
+        return list(pool.map(load_and_parse_calendar, file_paths))
+
 # --- Example Usage (Updated to use the new function) ---
 if __name__ == "__main__":
     
@@ -165,7 +335,7 @@ if __name__ == "__main__":
         if calendar_data["events"]:
             first_event = calendar_data["events"][0]
             print("Data for the first event:")
-            print(json.dumps(first_event, indent=2))
+            print(json.dumps(to_json_safe(first_event), indent=2))
         else:
             print("The calendar file was parsed, but it contains no events.")
     
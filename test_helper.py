@@ -0,0 +1,44 @@
+import datetime
+import unittest
+
+from helper import parse_ics_to_raw
+
+
+class ParseIcsLineEndingTests(unittest.TestCase):
+    def test_bare_cr_line_endings(self):
+        ics_text = b"BEGIN:VEVENT\rDTSTART:20250106T093000\rDTEND:20250106T1030\rSUMMARY:Standup\rEND:VEVENT\r"
+        events = parse_ics_to_raw(ics_text)["events"]
+        self.assertEqual(len(events), 1)
+        self.assertEqual(events[0]["start_time"], datetime.time(9, 30))
+        self.assertEqual(events[0]["end_time"], datetime.time(10, 30))
+        self.assertEqual(events[0]["summary"], "Standup")
+
+    def test_bare_cr_folded_line(self):
+        ics_text = b"BEGIN:VEVENT\rSUMMARY:Long \r title\rEND:VEVENT\r"
+        events = parse_ics_to_raw(ics_text)["events"]
+        self.assertEqual(events[0]["summary"], "Long title")
+
+    def test_crlf_folded_line(self):
+        ics_text = b"BEGIN:VEVENT\r\nSUMMARY:Long \r\n title\r\nLOCATION:Room\r\n\t101\r\nEND:VEVENT\r\n"
+        events = parse_ics_to_raw(ics_text)["events"]
+        self.assertEqual(events[0]["summary"], "Long title")
+        self.assertEqual(events[0]["location"], "Room101")
+
+    def test_lf_folded_line(self):
+        ics_text = b"BEGIN:VEVENT\nSUMMARY:Long \n title\nLOCATION:Room\n\t101\nEND:VEVENT\n"
+        events = parse_ics_to_raw(ics_text)["events"]
+        self.assertEqual(events[0]["summary"], "Long title")
+        self.assertEqual(events[0]["location"], "Room101")
+
+
+class ParseIcsDatetimeTests(unittest.TestCase):
+    def test_hhmm_without_seconds(self):
+        # strptime's greedy %H%M%S used to read T1430 as 14:03.
+        ics_text = b"BEGIN:VEVENT\r\nDTSTART:20250106T1430\r\nDTEND:20250106T1545Z\r\nEND:VEVENT\r\n"
+        events = parse_ics_to_raw(ics_text)["events"]
+        self.assertEqual(events[0]["start_time"], datetime.time(14, 30))
+        self.assertEqual(events[0]["end_time"], datetime.time(15, 45))
+
+
+if __name__ == "__main__":
+    unittest.main()